@@ -5,10 +5,11 @@ gridworld 模块 - 实现多智能体运输任务的网格世界环境
 环境中多个智能体需要在 A 点和 B 点之间运送物品，同时避免碰撞。
 """
 
+import functools
+import inspect
 import numpy as np
-import random
 from enum import IntEnum
-from typing import List, Tuple, Dict, Optional, Set
+from typing import List, Tuple, Dict, Optional
 
 # 动作枚举，北南西东四个方向
 class Action(IntEnum):
@@ -18,21 +19,131 @@ class Action(IntEnum):
     EAST = 3   # 向右移动
 
 
+# 动作 → 位移 (行, 列) 查找表，按 Action 的取值索引
+_ACTION_DELTAS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]], dtype=np.int8)
+
+
 # 配置常量
 GRID_SIZE = 5  # 5x5 网格
 NUM_AGENTS = 4  # 4个智能体
 COLLISION_PENALTY = -10.0  # 碰撞惩罚
 DELIVERY_REWARD = 1.0  # 完成一次运送的奖励
+OBS_DIM = 8  # 每个智能体的观察维度
+
+# 位置、方向等状态以 int8 存储，网格大小受其取值范围限制
+_MAX_GRID_SIZE = np.iinfo(np.int8).max
+
+
+def _step_kernel(pos, carrying, directions, actions, key_A, key_B, G,
+                 coll_pen, deliv_rew, cell_dirs, next_pos, next_keys, rewards):
+    """
+    单步环境动力学的融合内核 (移动 → 碰撞检测 → 奖励更新)
+    
+    直接在 SoA 数组上原地更新 pos/carrying/directions，不分配任何 Python 对象。
+    位置统一编码为格子键 row * G + col，碰撞检测对每个格子的方向位做按位或，
+    只需 O(N) 次整数运算。cell_dirs 为调用方预分配的 G*G 格子表，
+    进入内核时必须全零，返回前会恢复为全零；next_pos/next_keys 为暂存区，
+    本步奖励写入 rewards。
+    
+    返回:
+        (n_collisions, n_deliveries)
+    """
+    N = pos.shape[0]
+    
+    # 计算下一个位置及其格子键，越界的移动保持原地
+    for i in range(N):
+        a = actions[i]
+        r = min(max(pos[i, 0] + _ACTION_DELTAS[a, 0], 0), G - 1)
+        c = min(max(pos[i, 1] + _ACTION_DELTAS[a, 1], 0), G - 1)
+        next_pos[i, 0] = r
+        next_pos[i, 1] = c
+        next_keys[i] = r * G + c
+    
+    # 按格子对方向位 (bit0: A→B, bit1: B→A) 做按位或，两位都出现的格子为对向碰撞
+    for i in range(N):
+        cell_dirs[next_keys[i]] |= 1 << directions[i]
+    
+    # A和B位置不检测碰撞
+    cell_dirs[key_A] = 0
+    cell_dirs[key_B] = 0
+    
+    # 更新位置、携带状态、方向和奖励
+    n_coll = 0
+    n_deliv = 0
+    for i in range(N):
+        k = next_keys[i]
+        rewards[i] = 0.0
+        if cell_dirs[k] == 3:
+            rewards[i] = coll_pen
+            n_coll += 1
+            continue
+        
+        pos[i, 0] = next_pos[i, 0]
+        pos[i, 1] = next_pos[i, 1]
+        
+        if k == key_A and directions[i] == 1:
+            carrying[i] = 1
+            directions[i] = 0
+        elif k == key_B and directions[i] == 0 and carrying[i] == 1:
+            carrying[i] = 0
+            rewards[i] += deliv_rew
+            n_deliv += 1
+            directions[i] = 1
+    
+    # 只清零本步写过的格子，保持格子表全零以供下一步复用
+    for i in range(N):
+        cell_dirs[next_keys[i]] = 0
+    
+    return n_coll, n_deliv
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_step_kernel():
+    """
+    返回以 njit(cache=True) 编译的 _step_kernel
+    
+    numba 为可选依赖且导入较慢，只在第一次构造 use_numba=True 的环境时才导入，
+    内核在首次调用时编译并缓存到磁盘；import gridworld 和不使用 numba 的环境
+    (包括 AsyncGridWorldEnv 的子进程) 都不承担这部分开销。
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        raise ImportError("use_numba=True 需要安装 numba") from None
+    return njit(cache=True)(_step_kernel)
 
 
 class GridWorldEnv:
-    """网格世界环境，实现多智能体的运输任务"""
+    """
+    网格世界环境，实现多智能体的运输任务
+    
+    以默认的 5x5 网格、4 个智能体且不使用 numba 构造时，
+    GridWorldEnv(...) 会返回特化的 GridWorld5x4Env 实例。
+    """
+    
+    def __new__(cls, *args, **kwargs):
+        if cls is GridWorldEnv:
+            config = _INIT_SIGNATURE.bind(None, *args, **kwargs)
+            config.apply_defaults()
+            if (config.arguments['grid_size'] == GridWorld5x4Env.GRID_SIZE
+                    and config.arguments['num_agents'] == GridWorld5x4Env.NUM_AGENTS
+                    and not config.arguments['use_numba']):
+                cls = GridWorld5x4Env
+        return super().__new__(cls)
+    
+    def __getnewargs_ex__(self):
+        # 反序列化/复制时按原始配置调用 __new__，保证得到同一个类
+        return (), {'grid_size': self.grid_size, 'num_agents': self.num_agents,
+                    'use_numba': self.use_numba}
     
     def __init__(self, 
                  grid_size: int = GRID_SIZE, 
                  num_agents: int = NUM_AGENTS,
                  collision_penalty: float = COLLISION_PENALTY,
-                 delivery_reward: float = DELIVERY_REWARD):
+                 delivery_reward: float = DELIVERY_REWARD,
+                 use_numba: bool = False,
+                 seed: Optional[int] = None,
+                 render_every: int = 1):
         """
         初始化网格世界环境
         
@@ -41,38 +152,65 @@ class GridWorldEnv:
             num_agents: 智能体数量 (默认 4)
             collision_penalty: 碰撞惩罚值 (默认 -10.0)
             delivery_reward: 成功运送的奖励值 (默认 1.0)
+            use_numba: 是否使用 numba 编译的单步内核，适用于大网格/多智能体 (默认 False)
+            seed: 随机种子 (默认 None)
+            render_every: render() 每隔多少步实际打印一次 (默认 1)
         """
+        # 在构造时导入 numba，缺少 numba 时立即报错
+        self._kernel = _numba_step_kernel() if use_numba else None
+        assert grid_size <= _MAX_GRID_SIZE, f"网格大小不能超过 {_MAX_GRID_SIZE} (状态以 int8 存储)"
+        
         self.grid_size = grid_size
         self.num_agents = num_agents
         self.collision_penalty = collision_penalty
         self.delivery_reward = delivery_reward
+        self.use_numba = use_numba
+        self.rng = np.random.default_rng(seed)
+        self.render_every = render_every
+        
+        # 预分配的 float32 观察缓冲区，每一步原地刷新 (int8 状态写入时自动转换)
+        self._obs_buf = np.empty((num_agents, OBS_DIM), dtype=np.float32)
+        
+        # 碰撞检测用的固定大小暂存区: 每个格子的方向位表 (保持全零)、方向位和碰撞掩码
+        self._cell_dirs_buf = np.zeros(grid_size * grid_size, dtype=np.uint8)
+        self._dir_bits_buf = np.empty(num_agents, dtype=np.uint8)
+        self._collided_buf = np.empty(num_agents, dtype=bool)
+        
+        # 每一步的动作、下一个位置、格子键和奖励缓冲区，避免单步内重复分配
+        self._actions_buf = np.empty(num_agents, dtype=np.int8)
+        self._next_pos_buf = np.empty((num_agents, 2), dtype=np.int8)
+        self._next_keys_buf = np.empty(num_agents, dtype=np.intp)
+        self._rewards_buf = np.zeros(num_agents, dtype=np.float32)
         
         # 环境重置
         self.reset()
     
-    def reset(self) -> Dict:
+    def reset(self) -> np.ndarray:
         """
         重置环境到初始状态
         
         返回:
-            包含初始观察的字典
+            初始观察数组，形状为 (num_agents, OBS_DIM)
         """
-        # 随机放置 A 和 B 的位置
-        self.location_A = self._random_position()
-        self.location_B = self._random_position()
+        # 一次无放回抽样得到两个不同的格子，作为 A 和 B 的位置
+        G = self.grid_size
+        a, b = self.rng.choice(G * G, size=2, replace=False)
+        self.location_A = np.array([a // G, a % G], dtype=np.int8)
+        self.location_B = np.array([b // G, b % G], dtype=np.int8)
         
-        # 确保 A 和 B 不在同一位置
-        while self.location_A == self.location_B:
-            self.location_B = self._random_position()
+        # 缓存 A 和 B 的格子键 (row * G + col)，整局内不变
+        self._A_key = int(a)
+        self._B_key = int(b)
         
-        # 初始化智能体位置，默认都在 A 位置
-        self.agent_positions = [self.location_A.copy() for _ in range(self.num_agents)]
+        # 智能体状态以 SoA (Structure-of-Arrays) 形式存储
+        # 位置为 (num_agents, 2) 的数组，默认都在 A 位置
+        self.pos = np.broadcast_to(self.location_A, (self.num_agents, 2)).copy()
         
         # 智能体是否携带物品 (0: 未携带, 1: 携带)
-        self.carrying = [0] * self.num_agents
+        self.carrying = np.zeros(self.num_agents, dtype=np.int8)
         
-        # 智能体的方向 (0: A→B, 1: B→A)
-        self.directions = [0] * self.num_agents  # 初始都是从 A 到 B
+        # 智能体的方向 (0: A→B, 1: B→A)，初始都是从 A 到 B
+        self.directions = np.zeros(self.num_agents, dtype=np.int8)
         
         # 累计步数和奖励
         self.steps = 0
@@ -80,60 +218,46 @@ class GridWorldEnv:
         self.total_collisions = 0
         self.total_deliveries = 0
         
+        # A和B的位置整局内不变，只在重置时写入观察缓冲区
+        self._obs_buf[:, 2:4] = self.location_A
+        self._obs_buf[:, 4:6] = self.location_B
+        
         # 返回初始观察
         return self._get_observations()
     
-    def step(self, actions: List[int]) -> Tuple[Dict, List[float], bool, Dict]:
+    def step(self, actions: List[int]) -> Tuple[np.ndarray, np.ndarray, bool, Dict]:
         """
         执行环境中的一步。
         
         参数:
             actions: 每个智能体的动作列表
-            
+        
         返回:
             (observations, rewards, done, info)
+            observations 和 rewards 指向预分配的缓冲区，下一步会被覆盖，
+            需要跨步保留时请 copy()
         """
         assert len(actions) == self.num_agents, "动作数量必须等于智能体数量"
+        actions_arr = self._load_actions(actions)
         
         # 增加步数计数
         self.steps += 1
         
-        # 计算下一个位置
-        next_positions = []
-        for agent_idx, action in enumerate(actions):
-            next_pos = self._get_next_position(self.agent_positions[agent_idx], action)
-            next_positions.append(next_pos)
+        if self.use_numba:
+            n_coll, n_deliv = self._kernel(
+                self.pos, self.carrying, self.directions, actions_arr,
+                self._A_key, self._B_key, self.grid_size,
+                self.collision_penalty, self.delivery_reward,
+                self._cell_dirs_buf, self._next_pos_buf, self._next_keys_buf,
+                self._rewards_buf)
+        else:
+            n_coll, n_deliv = self._step_numpy(actions_arr)
+        rewards = self._rewards_buf
         
-        # 检测碰撞
-        rewards = [0.0] * self.num_agents
-        collisions = self._detect_collisions(next_positions)
-        
-        # 更新位置和奖励
-        for agent_idx, next_pos in enumerate(next_positions):
-            if agent_idx in collisions:
-                # 发生碰撞，不更新位置，给予惩罚
-                rewards[agent_idx] += self.collision_penalty
-                self.total_collisions += 1
-            else:
-                # 没有碰撞，更新位置
-                self.agent_positions[agent_idx] = next_pos
-                
-                # 检查是否到达目标点
-                if self._is_at_location_A(agent_idx) and self.directions[agent_idx] == 1:
-                    # 从 B 到 A，获取新物品
-                    self.carrying[agent_idx] = 1
-                    self.directions[agent_idx] = 0  # 现在方向是 A→B
-                
-                elif self._is_at_location_B(agent_idx) and self.directions[agent_idx] == 0:
-                    # 从 A 到 B，递送物品
-                    if self.carrying[agent_idx] == 1:
-                        self.carrying[agent_idx] = 0
-                        rewards[agent_idx] += self.delivery_reward
-                        self.total_deliveries += 1
-                        self.directions[agent_idx] = 1  # 现在方向是 B→A
-        
-        # 更新总奖励
-        self.total_reward += sum(rewards)
+        # 更新统计量，总奖励直接由计数得出，无需再遍历奖励数组
+        self.total_collisions += n_coll
+        self.total_deliveries += n_deliv
+        self.total_reward += n_coll * self.collision_penalty + n_deliv * self.delivery_reward
         
         # 获取新的观察
         observations = self._get_observations()
@@ -151,26 +275,64 @@ class GridWorldEnv:
         
         return observations, rewards, done, info
     
-    def _random_position(self) -> List[int]:
-        """生成随机位置"""
-        return [random.randint(0, self.grid_size-1), random.randint(0, self.grid_size-1)]
+    def _load_actions(self, actions) -> np.ndarray:
+        """
+        把动作写入 int8 缓冲区并统一校验，返回缓冲区本身
+        
+        numba 内核和 NumPy 路径都不再做越界检查；与原始输入比较是为了
+        发现写入 int8 时发生回绕的越界值 (如 256) 和非整数值 (如 1.5)。
+        """
+        actions_arr = self._actions_buf
+        actions_arr[:] = actions
+        assert ((actions_arr >= 0) & (actions_arr < len(Action)) & (actions_arr == actions)).all(), \
+            "动作必须是 0 到 3 之间的整数"
+        return actions_arr
     
-    def _get_next_position(self, current_pos: List[int], action: int) -> List[int]:
-        """计算给定动作后的下一个位置"""
-        next_pos = current_pos.copy()
-        
-        if action == Action.NORTH and next_pos[0] > 0:
-            next_pos[0] -= 1
-        elif action == Action.SOUTH and next_pos[0] < self.grid_size - 1:
-            next_pos[0] += 1
-        elif action == Action.WEST and next_pos[1] > 0:
-            next_pos[1] -= 1
-        elif action == Action.EAST and next_pos[1] < self.grid_size - 1:
-            next_pos[1] += 1
-        
-        return next_pos
+    def _step_numpy(self, actions_arr: np.ndarray) -> Tuple[int, int]:
+        """
+        以向量化 NumPy 操作执行单步动力学，原地更新智能体状态，本步奖励写入 _rewards_buf
+        
+        返回:
+            (n_collisions, n_deliveries)
+        """
+        G = self.grid_size
+        
+        # 一次性计算所有智能体的下一个位置，越界的移动被裁剪回原地
+        next_positions = self._next_pos_buf
+        np.take(_ACTION_DELTAS, actions_arr, axis=0, out=next_positions)
+        next_positions += self.pos
+        np.clip(next_positions, 0, G - 1, out=next_positions)
+        
+        # 将位置编码为格子键 row * G + col，碰撞检测和到达A/B的判断共用
+        next_keys = self._next_keys_buf
+        np.multiply(next_positions[:, 0], G, out=next_keys, dtype=np.intp)
+        next_keys += next_positions[:, 1]
+        
+        # 检测碰撞
+        collided = self._detect_collisions(next_keys)
+        moved = ~collided
+        
+        # 发生碰撞的智能体不更新位置，给予惩罚；其余智能体更新位置
+        rewards = self._rewards_buf
+        rewards.fill(0)
+        np.copyto(rewards, self.collision_penalty, where=collided)
+        np.copyto(self.pos, next_positions, where=moved[:, None])
+        
+        # 从 B 到 A，到达 A 后获取新物品，现在方向是 A→B
+        pick_up = moved & (next_keys == self._A_key) & (self.directions == 1)
+        self.carrying[pick_up] = 1
+        self.directions[pick_up] = 0
+        
+        # 从 A 到 B，携带物品到达 B 后递送，现在方向是 B→A
+        deliver = (moved & (next_keys == self._B_key) & (self.directions == 0)
+                   & (self.carrying == 1))
+        self.carrying[deliver] = 0
+        self.directions[deliver] = 1
+        rewards[deliver] += self.delivery_reward
+        
+        return int(np.count_nonzero(collided)), int(np.count_nonzero(deliver))
     
-    def _detect_collisions(self, next_positions: List[List[int]]) -> Set[int]:
+    def _detect_collisions(self, next_keys: np.ndarray) -> np.ndarray:
         """
         检测碰撞的智能体
         
@@ -178,53 +340,33 @@ class GridWorldEnv:
         1. 如果两个智能体一个从A→B，一个从B→A，且进入同一个格子，则发生对向碰撞
         2. 如果所有进入同一格子的智能体方向相同，则不算碰撞
         3. A和B位置不检测碰撞
+        
+        参数:
+            next_keys: 每个智能体下一个位置的格子键 row * G + col
+        
+        返回:
+            形状为 (num_agents,) 的布尔掩码，指向预分配的缓冲区，下一步会被覆盖
         """
-        collisions = set()
-        
-        # 建立位置到智能体的映射
-        pos_to_agents = {}
-        for agent_idx, pos in enumerate(next_positions):
-            pos_tuple = tuple(pos)
-            if pos_tuple not in pos_to_agents:
-                pos_to_agents[pos_tuple] = []
-            pos_to_agents[pos_tuple].append(agent_idx)
-        
-        # 检查每个有多个智能体的位置
-        for pos_tuple, agents in pos_to_agents.items():
-            # 如果位置是A或B，不检测碰撞
-            if (pos_tuple == tuple(self.location_A) or 
-                pos_tuple == tuple(self.location_B)):
-                continue
-            
-            # 如果只有一个智能体，不会碰撞
-            if len(agents) <= 1:
-                continue
-            
-            # 检查是否有方向不同的智能体
-            has_A_to_B = False
-            has_B_to_A = False
-            
-            for agent_idx in agents:
-                if self.directions[agent_idx] == 0:  # A→B
-                    has_A_to_B = True
-                else:  # B→A
-                    has_B_to_A = True
-            
-            # 如果同时有A→B和B→A的智能体，则发生碰撞
-            if has_A_to_B and has_B_to_A:
-                collisions.update(agents)
+        cell_dirs = self._cell_dirs_buf
+        dir_bits = self._dir_bits_buf
         
-        return collisions
-    
-    def _is_at_location_A(self, agent_idx: int) -> bool:
-        """检查智能体是否在位置A"""
-        return self.agent_positions[agent_idx] == self.location_A
-    
-    def _is_at_location_B(self, agent_idx: int) -> bool:
-        """检查智能体是否在位置B"""
-        return self.agent_positions[agent_idx] == self.location_B
+        # 方向位 bit0: A→B, bit1: B→A，即 1 << direction，对 0/1 取值等于 direction + 1
+        np.add(self.directions, 1, out=dir_bits, casting='unsafe')
+        
+        # 按格子对方向位做按位或，两位都出现即为对向；A和B位置除外
+        np.bitwise_or.at(cell_dirs, next_keys, dir_bits)
+        cell_dirs[self._A_key] = 0
+        cell_dirs[self._B_key] = 0
+        # 方向位已经写入格子表，dir_bits 复用为每个智能体所在格子的方向位
+        np.take(cell_dirs, next_keys, out=dir_bits)
+        np.equal(dir_bits, 3, out=self._collided_buf)
+        
+        # 只清零本步写过的格子，保持格子表全零以供下一步复用
+        cell_dirs[next_keys] = 0
+        
+        return self._collided_buf
     
-    def _get_observations(self) -> Dict:
+    def _get_observations(self) -> np.ndarray:
         """
         获取所有智能体的观察
         
@@ -233,38 +375,64 @@ class GridWorldEnv:
         2. A和B的位置
         3. 是否携带物品
         4. 自己的方向(A→B或B→A)
+        
+        观察原地写入预分配的 (num_agents, OBS_DIM) 缓冲区，列布局为
+        [row, col, A_row, A_col, B_row, B_col, carrying, direction]。
+        A和B的列由 reset() 写入，这里只刷新每步变化的列。
+        返回的是缓冲区本身，下一次 step()/reset() 会覆盖它，需要跨步保留时请 copy()。
         """
-        observations = {}
-        
-        for agent_idx in range(self.num_agents):
-            # 基本观察
-            obs = {
-                'position': self.agent_positions[agent_idx],
-                'location_A': self.location_A,
-                'location_B': self.location_B,
-                'carrying': self.carrying[agent_idx],
-                'direction': self.directions[agent_idx]
-            }
-            
-            observations[agent_idx] = obs
+        buf = self._obs_buf
+        buf[:, 0:2] = self.pos
+        buf[:, 6] = self.carrying
+        buf[:, 7] = self.directions
+        return buf
+    
+    def as_dict(self) -> Dict:
+        """
+        以旧版的按智能体索引的字典格式返回当前观察
+        
+        与最初的实现一致，位置为 [row, col] 列表，携带状态和方向为 Python int。
+        
+        返回:
+            {agent_idx: {'position', 'location_A', 'location_B', 'carrying', 'direction'}}
+        """
+        location_A = self.location_A.tolist()
+        location_B = self.location_B.tolist()
         
-        return observations
+        return {
+            agent_idx: {
+                'position': position,
+                'location_A': list(location_A),
+                'location_B': list(location_B),
+                'carrying': carrying,
+                'direction': direction
+            }
+            for agent_idx, (position, carrying, direction) in enumerate(
+                zip(self.pos.tolist(), self.carrying.tolist(), self.directions.tolist()))
+        }
     
     def render(self):
-        """打印环境的当前状态"""
-        grid = [[' ' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        """
+        打印环境的当前状态
+        
+        只在 steps 为 render_every 的整数倍时打印，训练循环中可以调大该值降低开销。
+        网格直接由 SoA 状态构建，并拼接成一个字符串一次性输出。
+        """
+        if self.steps % self.render_every != 0:
+            return
+        
+        G = self.grid_size
+        grid = np.full((G, G), ' ', dtype='<U8')
         
         # 标记A和B位置
-        a_row, a_col = self.location_A
-        b_row, b_col = self.location_B
-        grid[a_row][a_col] = 'A'
-        grid[b_row][b_col] = 'B'
+        grid[self.location_A[0], self.location_A[1]] = 'A'
+        grid[self.location_B[0], self.location_B[1]] = 'B'
         
         # 标记智能体位置
-        for i, (row, col) in enumerate(self.agent_positions):
+        for i, (row, col) in enumerate(self.pos.tolist()):
             # 如果格子已经有A或B，在后面加上智能体编号
-            if grid[row][col] in ['A', 'B']:
-                grid[row][col] += str(i)
+            if grid[row, col] in ('A', 'B'):
+                grid[row, col] += str(i)
             else:
                 # 标记携带状态和方向
                 marker = str(i)
@@ -274,16 +442,162 @@ class GridWorldEnv:
                     marker += '→'  # A→B方向
                 else:
                     marker += '←'  # B→A方向
-                grid[row][col] = marker
-        
-        # 打印网格
-        print(f"Step: {self.steps}, Deliveries: {self.total_deliveries}, Collisions: {self.total_collisions}")
-        print("-" * (self.grid_size * 4 + 1))
-        for row in grid:
-            print("| " + " | ".join(f"{cell:<3}" for cell in row) + " |")
-            print("-" * (self.grid_size * 4 + 1))
+                grid[row, col] = marker
+        
+        # 拼接并打印网格
+        separator = "-" * (G * 4 + 1)
+        lines = [f"Step: {self.steps}, Deliveries: {self.total_deliveries}, Collisions: {self.total_collisions}",
+                 separator]
+        for row in np.char.ljust(grid, 3):
+            lines.append("| " + " | ".join(row) + " |")
+            lines.append(separator)
+        print("\n".join(lines))
+
+
+class GridWorld5x4Env(GridWorldEnv):
+    """
+    默认配置 (5x5 网格, 4 个智能体) 的特化环境
+    
+    网格大小和智能体数量为字面常量，单步动力学用纯 Python 整数实现:
+    下一个格子由预先计算好的 25x4 查找表给出，6 对智能体的碰撞检查完全展开，
+    碰撞结果保存在一个 4 位的整数位集中，每步只在开头和结尾与 SoA 数组交换一次数据。
+    """
+    
+    GRID_SIZE = 5
+    NUM_AGENTS = 4
+    
+    def __init__(self,
+                 grid_size: int = GRID_SIZE,
+                 num_agents: int = NUM_AGENTS,
+                 collision_penalty: float = COLLISION_PENALTY,
+                 delivery_reward: float = DELIVERY_REWARD,
+                 use_numba: bool = False,
+                 seed: Optional[int] = None,
+                 render_every: int = 1):
+        assert grid_size == self.GRID_SIZE and num_agents == self.NUM_AGENTS, \
+            "GridWorld5x4Env 只支持 5x5 网格和 4 个智能体"
+        super().__init__(grid_size, num_agents, collision_penalty, delivery_reward,
+                         use_numba, seed, render_every)
+    
+    def step(self, actions: List[int]) -> Tuple[np.ndarray, np.ndarray, bool, Dict]:
+        """
+        执行环境中的一步，语义与 GridWorldEnv.step 完全相同
+        
+        参数:
+            actions: 每个智能体的动作列表
+        
+        返回:
+            (observations, rewards, done, info)
+            observations 和 rewards 指向预分配的缓冲区，下一步会被覆盖，
+            需要跨步保留时请 copy()
+        """
+        if self.use_numba:
+            return super().step(actions)
+        
+        assert len(actions) == 4, "动作数量必须等于智能体数量"
+        a0, a1, a2, a3 = actions
+        if type(a0) is int and type(a1) is int and type(a2) is int and type(a3) is int:
+            assert 0 <= a0 < 4 and 0 <= a1 < 4 and 0 <= a2 < 4 and 0 <= a3 < 4, \
+                "动作必须是 0 到 3 之间的整数"
+        else:
+            # 非 Python int 的动作 (如 1.0、NumPy 标量或数组) 按 GridWorldEnv.step 的规则转换和校验
+            a0, a1, a2, a3 = self._load_actions(actions).tolist()
+        
+        # 增加步数计数
+        self.steps += 1
+        
+        # 计算下一个格子键
+        (r0, c0), (r1, c1), (r2, c2), (r3, c3) = self.pos.tolist()
+        n0 = _NEXT_KEY_5x5[r0 * 5 + c0][a0]
+        n1 = _NEXT_KEY_5x5[r1 * 5 + c1][a1]
+        n2 = _NEXT_KEY_5x5[r2 * 5 + c2][a2]
+        n3 = _NEXT_KEY_5x5[r3 * 5 + c3][a3]
+        
+        # 展开的 6 对碰撞检查: 同一格子、方向相反且不在A或B，则两者都发生碰撞
+        dirs = self.directions.tolist()
+        d0, d1, d2, d3 = dirs
+        A = self._A_key
+        B = self._B_key
+        coll = 0
+        if n0 == n1 and d0 != d1 and n0 != A and n0 != B:
+            coll |= 0b0011
+        if n0 == n2 and d0 != d2 and n0 != A and n0 != B:
+            coll |= 0b0101
+        if n0 == n3 and d0 != d3 and n0 != A and n0 != B:
+            coll |= 0b1001
+        if n1 == n2 and d1 != d2 and n1 != A and n1 != B:
+            coll |= 0b0110
+        if n1 == n3 and d1 != d3 and n1 != A and n1 != B:
+            coll |= 0b1010
+        if n2 == n3 and d2 != d3 and n2 != A and n2 != B:
+            coll |= 0b1100
+        
+        # 更新位置、携带状态、方向和奖励
+        keys = [r0 * 5 + c0, r1 * 5 + c1, r2 * 5 + c2, r3 * 5 + c3]
+        next_keys = (n0, n1, n2, n3)
+        carrying = self.carrying.tolist()
+        rewards = [0.0, 0.0, 0.0, 0.0]
+        n_coll = 0
+        n_deliv = 0
+        for i in range(4):
+            if (coll >> i) & 1:
+                # 发生碰撞，不更新位置，给予惩罚
+                rewards[i] = self.collision_penalty
+                n_coll += 1
+                continue
+            
+            k = next_keys[i]
+            keys[i] = k
+            if k == A and dirs[i] == 1:
+                # 从 B 到 A，获取新物品，现在方向是 A→B
+                carrying[i] = 1
+                dirs[i] = 0
+            elif k == B and dirs[i] == 0 and carrying[i] == 1:
+                # 从 A 到 B，递送物品，现在方向是 B→A
+                carrying[i] = 0
+                rewards[i] = self.delivery_reward
+                n_deliv += 1
+                dirs[i] = 1
+        
+        # 一次性写回 SoA 状态
+        self.pos[:] = [_KEY_TO_POS_5x5[k] for k in keys]
+        self.carrying[:] = carrying
+        self.directions[:] = dirs
+        self._rewards_buf[:] = rewards
+        
+        # 更新统计量，总奖励直接由计数得出
+        self.total_collisions += n_coll
+        self.total_deliveries += n_deliv
+        self.total_reward += n_coll * self.collision_penalty + n_deliv * self.delivery_reward
+        
+        # 获取新的观察
+        observations = self._get_observations()
+        
+        # 额外信息
+        info = {
+            'steps': self.steps,
+            'total_reward': self.total_reward,
+            'total_collisions': self.total_collisions,
+            'total_deliveries': self.total_deliveries
+        }
+        
+        return observations, self._rewards_buf, False, info
+
+
+# GridWorldEnv.__new__ 用来判断构造参数是否为默认配置
+_INIT_SIGNATURE = inspect.signature(GridWorldEnv.__init__)
+
+# 5x5 网格上每个格子在四个动作下的下一个格子键 (越界的移动保持原地)
+_NEXT_KEY_5x5 = tuple(
+    tuple(min(max(r + dr, 0), 4) * 5 + min(max(c + dc, 0), 4)
+          for dr, dc in _ACTION_DELTAS.tolist())
+    for r in range(5) for c in range(5)
+)
+
+# 5x5 网格的格子键 → (row, col)
+_KEY_TO_POS_5x5 = tuple(divmod(k, 5) for k in range(25))
 
 
 # 导出主要的类和常量
-__all__ = ['GridWorldEnv', 'Action', 'GRID_SIZE', 'NUM_AGENTS', 
-           'COLLISION_PENALTY', 'DELIVERY_REWARD']
+__all__ = ['GridWorldEnv', 'GridWorld5x4Env', 'Action', 'GRID_SIZE', 'NUM_AGENTS', 
+           'COLLISION_PENALTY', 'DELIVERY_REWARD', 'OBS_DIM']
@@ -0,0 +1,255 @@
+"""
+异步环境模块 - 在子进程中并行运行多个网格世界
+
+此模块提供 AsyncGridWorldEnv，每个环境运行在独立的子进程中，通过 Pipe 通信。
+当用户继承 GridWorldEnv 加入较重的 Python 逻辑时，单进程的批量环境会被 GIL 串行化，
+而多进程可以把每个环境的 Python 开销并行地隐藏起来。
+"""
+
+import inspect
+import multiprocessing as mp
+import traceback
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple, Type
+
+import numpy as np
+
+from . import GridWorldEnv
+
+
+def _worker(conn, env_cls: Type[GridWorldEnv], env_kwargs: Dict) -> None:
+    """
+    子进程主循环: 持有一个环境实例，按命令执行并把结果发回主进程
+    
+    支持的命令:
+        ('reset', None)   → 返回初始观察
+        ('step', actions) → 返回 (observations, rewards, done, info)
+        ('close', None)   → 退出循环
+    
+    每条命令都会得到一条回复: 成功时为 ('ok', result)，执行命令时抛出异常则为
+    ('error', traceback)，由主进程重新抛出，子进程继续等待下一条命令。
+    环境构造失败时，之后的每条命令都以构造时的异常回复。
+    """
+    env = None
+    init_error = None
+    try:
+        env = env_cls(**env_kwargs)
+    except Exception:
+        init_error = traceback.format_exc()
+    
+    try:
+        while True:
+            cmd, data = conn.recv()
+            if cmd == 'close':
+                break
+            if init_error is not None:
+                conn.send(('error', init_error))
+                continue
+            
+            try:
+                if cmd == 'step':
+                    result = env.step(data)
+                elif cmd == 'reset':
+                    result = env.reset()
+                else:
+                    raise ValueError(f"未知命令: {cmd}")
+                # send 会立即序列化结果，因此可以直接发送环境内部的缓冲区
+                conn.send(('ok', result))
+            except Exception:
+                conn.send(('error', traceback.format_exc()))
+    except (KeyboardInterrupt, EOFError, BrokenPipeError):
+        pass
+    finally:
+        conn.close()
+
+
+class AsyncGridWorldEnv:
+    """
+    多进程异步网格世界环境
+    
+    每个环境运行在一个独立的子进程中，step_async() 把动作广播给所有子进程后立即返回，
+    step_wait() 通过 multiprocessing.connection.wait() 按完成顺序收集结果，
+    慢的子进程不会阻塞对其余子进程结果的接收。
+    子进程中抛出的异常会在主进程中以 RuntimeError 重新抛出，子进程本身保持可用。
+    
+    用法:
+        env = AsyncGridWorldEnv(num_envs=8, seed=0)
+        obs = env.reset()                   # (K, N, OBS_DIM)
+        env.step_async(actions)             # actions: (K, N)
+        obs, rewards, dones, infos = env.step_wait()
+        env.close()
+    """
+    
+    def __init__(self,
+                 num_envs: int,
+                 env_cls: Type[GridWorldEnv] = GridWorldEnv,
+                 seed: Optional[int] = None,
+                 start_method: Optional[str] = None,
+                 **env_kwargs):
+        """
+        初始化多进程异步网格世界环境
+        
+        参数:
+            num_envs: 子进程 (环境) 数量 K
+            env_cls: 每个子进程中实例化的环境类，可以是 GridWorldEnv 的子类
+            seed: 随机种子，第 k 个环境使用 seed + k (默认 None)；
+                  仅当 env_cls 接受 seed 参数时才会传入
+            start_method: multiprocessing 的启动方式，如 'fork'/'spawn' (默认使用平台默认值)
+            **env_kwargs: 传给 env_cls 的其余参数
+        """
+        self.num_envs = num_envs
+        self.closed = False
+        self._waiting = False
+        
+        # 只有 env_cls 接受 seed (或 **kwargs) 时才注入每个环境的种子
+        params = inspect.signature(env_cls).parameters.values()
+        accepts_seed = any(p.name == 'seed' or p.kind is inspect.Parameter.VAR_KEYWORD
+                           for p in params)
+        
+        ctx = mp.get_context(start_method)
+        self.pipes = []
+        self.processes = []
+        for k in range(num_envs):
+            kwargs = dict(env_kwargs)
+            if seed is not None and accepts_seed:
+                kwargs['seed'] = seed + k
+            
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(child_conn, env_cls, kwargs),
+                                  daemon=True)
+            process.start()
+            # 子进程持有自己的一端，主进程关闭它以便子进程退出时能收到 EOF
+            child_conn.close()
+            
+            self.pipes.append(parent_conn)
+            self.processes.append(process)
+    
+    def reset(self) -> np.ndarray:
+        """
+        重置所有环境
+        
+        返回:
+            观察数组，形状为 (K, N, OBS_DIM)
+        """
+        assert not self.closed, "环境已关闭"
+        assert not self._waiting, "上一次 step_async() 的结果尚未通过 step_wait() 取回"
+        
+        self._broadcast('reset', [None] * self.num_envs)
+        return np.stack(self._gather())
+    
+    def step_async(self, actions) -> None:
+        """
+        把每个环境的动作发送给对应的子进程，不等待结果
+        
+        参数:
+            actions: 形状为 (K, N) 的动作数组
+        """
+        assert not self.closed, "环境已关闭"
+        assert not self._waiting, "上一次 step_async() 的结果尚未通过 step_wait() 取回"
+        assert len(actions) == self.num_envs, "动作数量必须等于环境数量"
+        
+        self._broadcast('step', actions)
+        self._waiting = True
+    
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """
+        等待所有子进程完成 step_async() 发出的一步
+        
+        返回:
+            (observations, rewards, dones, infos)，
+            observations 形状为 (K, N, OBS_DIM)，rewards 形状为 (K, N)，
+            dones 形状为 (K,)，infos 为每个环境的 info 字典列表
+        """
+        assert self._waiting, "必须先调用 step_async()"
+        
+        results = self._gather()
+        self._waiting = False
+        
+        observations, rewards, dones, infos = zip(*results)
+        return np.stack(observations), np.stack(rewards), np.array(dones), list(infos)
+    
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict]]:
+        """同步执行一步，等价于 step_async() 后紧接 step_wait()"""
+        self.step_async(actions)
+        return self.step_wait()
+    
+    def close(self, timeout: Optional[float] = 1.0) -> None:
+        """
+        通知所有子进程退出并回收进程
+        
+        已经退出或出错的子进程不会让 close() 失败: 通信错误被忽略，
+        超过 timeout 秒仍未退出的子进程会被强制终止。
+        
+        参数:
+            timeout: 等待每个子进程退出的秒数 (默认 1.0)
+        """
+        if self.closed:
+            return
+        
+        try:
+            if self._waiting:
+                try:
+                    self._gather()
+                except (RuntimeError, EOFError, BrokenPipeError, OSError):
+                    pass
+            for pipe in self.pipes:
+                try:
+                    pipe.send(('close', None))
+                except (BrokenPipeError, OSError):
+                    pass
+            for process in self.processes:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            for pipe in self.pipes:
+                pipe.close()
+        finally:
+            self.closed = True
+    
+    def _broadcast(self, cmd: str, data) -> None:
+        """
+        把命令 cmd 和第 k 份数据 data[k] 发送给第 k 个子进程
+        
+        已经退出的子进程无法接收命令，这里忽略发送错误，
+        随后的 _gather() 会在它的管道上读到 EOF 并报告该子进程意外退出。
+        """
+        for pipe, env_data in zip(self.pipes, data):
+            try:
+                pipe.send((cmd, env_data))
+            except (BrokenPipeError, OSError):
+                pass
+    
+    def _gather(self) -> List:
+        """
+        按完成顺序接收每个子进程的结果，并按环境编号排列返回
+        
+        任一子进程报告异常或意外退出时，先收完其余子进程的结果，
+        再以 RuntimeError 抛出第一个错误。
+        """
+        results = [None] * self.num_envs
+        pending = {pipe: k for k, pipe in enumerate(self.pipes)}
+        error = None
+        while pending:
+            for pipe in wait(list(pending)):
+                k = pending.pop(pipe)
+                try:
+                    status, payload = pipe.recv()
+                except EOFError:
+                    status, payload = 'error', "子进程意外退出"
+                if status == 'ok':
+                    results[k] = payload
+                elif error is None:
+                    error = f"子进程 {k} 出错:\n{payload}"
+        if error is not None:
+            self._waiting = False
+            raise RuntimeError(error)
+        return results
+    
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
+
+
+# 导出主要的类
+__all__ = ['AsyncGridWorldEnv']
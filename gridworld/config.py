@@ -5,7 +5,7 @@
 奖励/惩罚值等，避免魔法数字散落各处。
 """
 
-from enum import Enum, auto
+from enum import Enum
 from typing import Tuple
 import collections.abc
 
@@ -26,24 +26,19 @@ Pos = Tuple[int, int]
 class Dir(Enum):
     """
     方向枚举类，提供四个基本方向的向量表示
+    
+    每个成员的值就是它的(dx,dy)向量，vector 直接返回该值。
     """
     # 北、南、东、西四个方向
-    N = auto()  # 北 (-1, 0)
-    S = auto()  # 南 (1, 0)
-    E = auto()  # 东 (0, 1)
-    W = auto()  # 西 (0, -1)
+    N = (-1, 0)  # 北
+    S = (1, 0)   # 南
+    E = (0, 1)   # 东
+    W = (0, -1)  # 西
     
     @property
     def vector(self) -> Tuple[int, int]:
         """返回方向对应的(dx,dy)向量"""
-        if self == Dir.N:
-            return (-1, 0)
-        elif self == Dir.S:
-            return (1, 0)
-        elif self == Dir.E:
-            return (0, 1)
-        elif self == Dir.W:
-            return (0, -1)
+        return self.value
 
 # 奖励/惩罚常量
 # -------------------------
@@ -0,0 +1,220 @@
+"""
+CUDA 环境模块 - 在 GPU 上批量运行网格世界
+
+此模块提供 CudaVectorGridWorldEnv，接口与 VectorGridWorldEnv 相同，
+但所有状态在初始化时一次性分配在显存中，之后每一步只启动一次 gridworld_step.cu
+中的 step_kernel (每个环境一个 thread-block，每个智能体一个线程)，
+观察和奖励以 CuPy 数组返回，训练全程无需在主机和设备之间拷贝数据。
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+from . import (_MAX_GRID_SIZE, GRID_SIZE, NUM_AGENTS, COLLISION_PENALTY,
+               DELIVERY_REWARD, OBS_DIM)
+
+try:
+    import cupy as cp
+except ImportError:  # cupy 为可选依赖，仅 CudaVectorGridWorldEnv 需要
+    cp = None
+
+
+# 单步内核源码，与本模块放在同一目录下
+_KERNEL_PATH = Path(__file__).with_name('gridworld_step.cu')
+
+# 每个 thread-block 的最大线程数，即单个环境允许的最大智能体数量
+_MAX_THREADS_PER_BLOCK = 1024
+
+# 不额外设置内核属性时，每个 thread-block 可用的动态共享内存上限 (字节)
+_MAX_SHARED_MEM = 48 * 1024
+
+
+class CudaVectorGridWorldEnv:
+    """
+    GPU 批量网格世界环境
+    
+    K 个环境的状态以 CuPy 数组的形式驻留在显存中:
+        pos:        (K, N, 2) 智能体位置
+        carrying:   (K, N)    是否携带物品
+        directions: (K, N)    方向 (0: A→B, 1: B→A)
+        location_A: (K, 2)    每个环境的 A 位置
+        location_B: (K, 2)    每个环境的 B 位置
+    
+    用法:
+        env = CudaVectorGridWorldEnv(num_envs=4096)
+        obs = env.reset()                                # cupy (K, N, OBS_DIM)
+        obs, rewards, dones, info = env.step(actions)    # actions: (K, N)
+    """
+    
+    def __init__(self,
+                 num_envs: int,
+                 grid_size: int = GRID_SIZE,
+                 num_agents: int = NUM_AGENTS,
+                 collision_penalty: float = COLLISION_PENALTY,
+                 delivery_reward: float = DELIVERY_REWARD,
+                 seed: Optional[int] = None):
+        """
+        初始化 GPU 批量网格世界环境
+        
+        参数:
+            num_envs: 并行环境数量 K
+            grid_size: 网格的大小 (默认 5x5)
+            num_agents: 每个环境的智能体数量 (默认 4)
+            collision_penalty: 碰撞惩罚值 (默认 -10.0)
+            delivery_reward: 成功运送的奖励值 (默认 1.0)
+            seed: 随机种子 (默认 None)
+        """
+        if cp is None:
+            raise ImportError("CudaVectorGridWorldEnv 需要安装 cupy")
+        assert num_agents <= _MAX_THREADS_PER_BLOCK, \
+            f"每个环境最多支持 {_MAX_THREADS_PER_BLOCK} 个智能体"
+        
+        assert grid_size <= _MAX_GRID_SIZE, f"网格大小不能超过 {_MAX_GRID_SIZE} (状态以 int8 存储)"
+        assert grid_size * grid_size * 4 <= _MAX_SHARED_MEM, \
+            f"格子表 ({grid_size}x{grid_size} 个 uint32) 超出了 {_MAX_SHARED_MEM} 字节的共享内存上限"
+        
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.num_agents = num_agents
+        self.collision_penalty = collision_penalty
+        self.delivery_reward = delivery_reward
+        self.rng = cp.random.RandomState(seed)
+        
+        K, N = num_envs, num_agents
+        
+        # 一次性分配在显存中的 SoA 状态
+        self.pos = cp.zeros((K, N, 2), dtype=cp.int8)
+        self.carrying = cp.zeros((K, N), dtype=cp.int8)
+        self.directions = cp.zeros((K, N), dtype=cp.int8)
+        self.location_A = cp.zeros((K, 2), dtype=cp.int8)
+        self.location_B = cp.zeros((K, 2), dtype=cp.int8)
+        self._A_keys = cp.zeros(K, dtype=cp.int32)
+        self._B_keys = cp.zeros(K, dtype=cp.int32)
+        
+        # 每个环境的累计步数和统计量，由内核原子地累加
+        self.steps = cp.zeros(K, dtype=cp.int64)
+        self.total_collisions = cp.zeros(K, dtype=cp.int32)
+        self.total_deliveries = cp.zeros(K, dtype=cp.int32)
+        
+        # 预分配的 float32 奖励和观察缓冲区，每一步原地刷新
+        self._rewards_buf = cp.zeros((K, N), dtype=cp.float32)
+        self._obs_buf = cp.empty((K, N, OBS_DIM), dtype=cp.float32)
+        
+        # 编译单步内核，格子表通过动态共享内存传入
+        self._step_kernel = cp.RawKernel(_KERNEL_PATH.read_text(encoding='utf-8'),
+                                         'step_kernel')
+        self._shared_mem = grid_size * grid_size * 4
+        
+        # 环境重置
+        self.reset()
+    
+    @property
+    def total_reward(self):
+        """每个环境的累计奖励，由碰撞和运送计数直接得出"""
+        return (self.total_collisions * self.collision_penalty
+                + self.total_deliveries * self.delivery_reward)
+    
+    def reset(self, mask=None):
+        """
+        在显存中重置环境到初始状态
+        
+        参数:
+            mask: 形状为 (K,) 的布尔数组，只重置为 True 的环境；默认重置全部环境
+        
+        返回:
+            观察数组，形状为 (K, N, OBS_DIM)
+        """
+        if mask is None:
+            idx = cp.arange(self.num_envs)
+        else:
+            idx = cp.flatnonzero(cp.asarray(mask))
+        
+        # 为所有需要重置的环境一次性抽样互不相同的 A 和 B
+        G = self.grid_size
+        a = self.rng.randint(0, G * G, size=len(idx))
+        b = self.rng.randint(0, G * G - 1, size=len(idx))
+        b += b >= a
+        self._A_keys[idx] = a
+        self._B_keys[idx] = b
+        self.location_A[idx] = cp.stack([a // G, a % G], axis=-1)
+        self.location_B[idx] = cp.stack([b // G, b % G], axis=-1)
+        
+        # 智能体都从 A 出发，未携带物品，方向为 A→B
+        self.pos[idx] = self.location_A[idx][:, None, :]
+        self.carrying[idx] = 0
+        self.directions[idx] = 0
+        
+        self.steps[idx] = 0
+        self.total_collisions[idx] = 0
+        self.total_deliveries[idx] = 0
+        
+        # A和B的位置整局内不变，只在重置时写入观察缓冲区
+        self._obs_buf[idx, :, 2:4] = self.location_A[idx][:, None, :]
+        self._obs_buf[idx, :, 4:6] = self.location_B[idx][:, None, :]
+        
+        return self._get_observations()
+    
+    def step(self, actions) -> Tuple:
+        """
+        在所有环境中同时执行一步
+        
+        参数:
+            actions: 形状为 (K, N) 的动作数组 (NumPy 或 CuPy)
+        
+        返回:
+            (observations, rewards, dones, info)，均为 CuPy 数组
+        """
+        actions_in = cp.asarray(actions)
+        actions_arr = cp.ascontiguousarray(actions_in.astype(cp.int8, copy=False))
+        assert actions_arr.shape == (self.num_envs, self.num_agents), \
+            "动作数组形状必须为 (num_envs, num_agents)"
+        # 与其他后端相同，转换为 int8 后统一校验动作，内核中的 switch 不处理非法动作
+        assert bool(((actions_arr >= 0) & (actions_arr < 4)
+                     & (actions_arr == actions_in)).all()), "动作必须是 0 到 3 之间的整数"
+        
+        # 增加步数计数
+        self.steps += 1
+        
+        # 每个环境一个 thread-block，每个智能体一个线程
+        self._step_kernel(
+            (self.num_envs,), (self.num_agents,),
+            (self.pos, self.carrying, self.directions, actions_arr,
+             self._A_keys, self._B_keys, self._rewards_buf,
+             self.total_collisions, self.total_deliveries,
+             cp.int32(self.grid_size), cp.int32(self.num_agents),
+             cp.float32(self.collision_penalty), cp.float32(self.delivery_reward)),
+            shared_mem=self._shared_mem)
+        
+        # 获取新的观察
+        observations = self._get_observations()
+        
+        # 这个任务是无限的，所以环境不会结束
+        dones = cp.zeros(self.num_envs, dtype=cp.bool_)
+        
+        # 额外信息，每项都是形状为 (K,) 的 CuPy 数组
+        info = {
+            'steps': self.steps.copy(),
+            'total_reward': self.total_reward,
+            'total_collisions': self.total_collisions.copy(),
+            'total_deliveries': self.total_deliveries.copy()
+        }
+        
+        return observations, self._rewards_buf, dones, info
+    
+    def _get_observations(self):
+        """
+        获取所有环境中所有智能体的观察
+        
+        列布局与 GridWorldEnv 相同:
+        [row, col, A_row, A_col, B_row, B_col, carrying, direction]。
+        返回的是显存中的缓冲区本身，需要跨步保留时请 copy()。
+        """
+        buf = self._obs_buf
+        buf[..., 0:2] = self.pos
+        buf[..., 6] = self.carrying
+        buf[..., 7] = self.directions
+        return buf
+
+
+# 导出主要的类
+__all__ = ['CudaVectorGridWorldEnv']
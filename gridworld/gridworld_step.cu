@@ -0,0 +1,91 @@
+// 网格世界单步内核 (CUDA)
+//
+// 每个 thread-block 负责一个环境，每个线程负责一个智能体。
+// 三个阶段之间用 __syncthreads() 同步:
+//   1. 计算下一个位置，并把方向位按位或进共享内存中的格子表
+//   2. 清除 A 和 B 格子的方向位 (A和B位置不检测碰撞)
+//   3. 根据格子表判定碰撞，更新位置、携带状态、方向和奖励
+//
+// 格子表 cell_dirs 大小为 G*G，通过动态共享内存传入，bit0: A→B, bit1: B→A，
+// 两位都出现的格子即为对向碰撞。所有状态数组在整个训练过程中驻留在显存中。
+
+extern "C" __global__
+void step_kernel(signed char* pos,              // (K, N, 2) 智能体位置
+                 signed char* carry,            // (K, N)    是否携带物品
+                 signed char* dir,              // (K, N)    方向 (0: A→B, 1: B→A)
+                 const signed char* actions,    // (K, N)    动作 (0: 北, 1: 南, 2: 西, 3: 东)
+                 const int* key_A,              // (K,)      A 的格子键 row * G + col
+                 const int* key_B,              // (K,)      B 的格子键 row * G + col
+                 float* rewards,                // (K, N)    本步奖励
+                 int* total_collisions,         // (K,)      累计碰撞次数
+                 int* total_deliveries,         // (K,)      累计运送次数
+                 int G,
+                 int N,
+                 float coll_pen,
+                 float deliv_rew)
+{
+    extern __shared__ unsigned int cell_dirs[];
+
+    const int env = blockIdx.x;
+    const int i = threadIdx.x;
+    const int idx = env * N + i;
+    const bool active = i < N;
+
+    // 清空本环境的格子表
+    for (int k = i; k < G * G; k += blockDim.x) {
+        cell_dirs[k] = 0u;
+    }
+    __syncthreads();
+
+    // 阶段 1: 计算下一个位置，越界的移动保持原地
+    int r = 0, c = 0, key = 0, d = 0;
+    if (active) {
+        r = pos[2 * idx];
+        c = pos[2 * idx + 1];
+        switch (actions[idx]) {
+            case 0: r = max(r - 1, 0); break;
+            case 1: r = min(r + 1, G - 1); break;
+            case 2: c = max(c - 1, 0); break;
+            case 3: c = min(c + 1, G - 1); break;
+        }
+        key = r * G + c;
+        d = dir[idx];
+        atomicOr(&cell_dirs[key], 1u << d);
+    }
+    __syncthreads();
+
+    // 阶段 2: A和B位置不检测碰撞
+    const int kA = key_A[env];
+    const int kB = key_B[env];
+    if (i == 0) {
+        cell_dirs[kA] = 0u;
+        cell_dirs[kB] = 0u;
+    }
+    __syncthreads();
+
+    // 阶段 3: 更新位置、携带状态、方向和奖励
+    if (active) {
+        float reward = 0.0f;
+        if (cell_dirs[key] == 3u) {
+            // 发生碰撞，不更新位置，给予惩罚
+            reward = coll_pen;
+            atomicAdd(&total_collisions[env], 1);
+        } else {
+            pos[2 * idx] = (signed char)r;
+            pos[2 * idx + 1] = (signed char)c;
+
+            if (key == kA && d == 1) {
+                // 从 B 到 A，获取新物品，现在方向是 A→B
+                carry[idx] = 1;
+                dir[idx] = 0;
+            } else if (key == kB && d == 0 && carry[idx] == 1) {
+                // 从 A 到 B，递送物品，现在方向是 B→A
+                carry[idx] = 0;
+                dir[idx] = 1;
+                reward += deliv_rew;
+                atomicAdd(&total_deliveries[env], 1);
+            }
+        }
+        rewards[idx] = reward;
+    }
+}
@@ -5,7 +5,6 @@
 使用中央时钟可以让智能体按照固定顺序执行，有助于减少碰撞。
 """
 
-import itertools
 import random
 from typing import List, Optional
 
@@ -31,7 +30,8 @@ class CentralClock:
             agent_ids: 需要调度的智能体ID列表
         """
         self.agent_ids = agent_ids.copy()
-        self._cycle = itertools.cycle(self.agent_ids)
+        # 下一个要调度的智能体在 agent_ids 中的位置
+        self._i = 0
     
     def __iter__(self) -> 'CentralClock':
         """
@@ -49,7 +49,14 @@ class CentralClock:
         返回:
             下一个智能体ID
         """
-        return next(self._cycle)
+        if not self.agent_ids:
+            raise StopIteration
+        
+        aid = self.agent_ids[self._i]
+        self._i += 1
+        if self._i == len(self.agent_ids):
+            self._i = 0
+        return aid
     
     def shuffle(self, new_order: Optional[List[int]] = None) -> None:
         """
@@ -66,8 +73,8 @@ class CentralClock:
             # 随机打乱当前顺序
             random.shuffle(self.agent_ids)
         
-        # 重置迭代器循环
-        self._cycle = itertools.cycle(self.agent_ids)
+        # 从新顺序的第一个智能体重新开始
+        self._i = 0
 
 
 class RoundRobin:
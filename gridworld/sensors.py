@@ -5,10 +5,19 @@
 用于检测周围8个方向的格子中是否有朝相反方向移动的智能体。
 """
 
+import numpy as np
 from typing import Tuple, List
 from .config import Dir, Pos
 
 
+# 周围8个相邻格子的 (行, 列) 偏移，顺序为: NW, N, NE, W, E, SW, S, SE
+NEIGHBOUR_OFFSETS = np.array([
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1),
+], dtype=np.int8)
+
+
 def neighbour_coords(pos: Pos) -> List[Pos]:
     """
     获取指定位置周围8个相邻格子的坐标
@@ -33,59 +42,54 @@ def neighbour_coords(pos: Pos) -> List[Pos]:
     ]
 
 
-def opp_dir_mask(env, agent_id: int) -> Tuple[bool, bool, bool, bool, bool, bool, bool, bool]:
+def opp_dir_masks(pos: np.ndarray, dirs: np.ndarray, grid_size: int) -> np.ndarray:
     """
-    返回长度为8的布尔元组，表示周围8个方向的格子是否有反向移动的智能体
+    一次性计算所有智能体的反向占用掩码
     
     参数:
-        env: 环境实例，包含智能体状态
-        agent_id: 当前智能体ID
+        pos: 智能体位置数组，形状为 (N, 2)
+        dirs: 智能体方向数组，形状为 (N,)，0: A→B, 1: B→A
+        grid_size: 网格大小
         
     返回:
-        8位布尔元组，按照 NW, N, NE, W, E, SW, S, SE 的顺序，
+        形状为 (N, 8) 的布尔数组，列顺序为 NW, N, NE, W, E, SW, S, SE，
         True 表示对应格子被"反向移动方向"的其他智能体占用
     """
-    # 从环境中获取智能体状态
-    agent_states = env.agent_states
-    
-    # 获取当前智能体的位置和方向标志
-    current_pos = agent_states[agent_id]['position']
-    current_dir_flag = agent_states[agent_id]['direction']  # 0: A→B, 1: B→A
+    pos = np.asarray(pos, dtype=np.intp)
+    dirs = np.asarray(dirs, dtype=np.intp)
+    G = grid_size
     
-    # 获取当前位置周围的8个格子坐标
-    neighbours = neighbour_coords(current_pos)
+    # 记录每个格子中出现过的方向位 (bit0: A→B, bit1: B→A)，同一格子可有多个智能体
+    cell_dirs = np.zeros(G * G, dtype=np.uint8)
+    np.bitwise_or.at(cell_dirs, pos[:, 0] * G + pos[:, 1],
+                     np.left_shift(1, dirs).astype(np.uint8))
     
-    # 初始化结果元组
-    mask = [False] * 8
+    # 所有智能体的8个相邻格子，形状为 (N, 8, 2)；超出网格边界的格子为 False
+    neighbours = pos[:, None, :] + NEIGHBOUR_OFFSETS
+    in_bounds = ((neighbours >= 0) & (neighbours < G)).all(axis=-1)
+    neighbour_keys = np.where(in_bounds, neighbours[..., 0] * G + neighbours[..., 1], 0)
     
-    # 网格大小
-    grid_size = env.grid_size
+    # 相邻格子中是否出现过与自身相反的方向
+    opposite_bit = np.left_shift(1, 1 - dirs).astype(np.uint8)
+    return in_bounds & ((cell_dirs[neighbour_keys] & opposite_bit[:, None]) != 0)
+
+
+def opp_dir_mask(env, agent_id: int) -> Tuple[bool, bool, bool, bool, bool, bool, bool, bool]:
+    """
+    返回长度为8的布尔元组，表示周围8个方向的格子是否有反向移动的智能体
     
-    # 检查每个相邻格子
-    for i, (nx, ny) in enumerate(neighbours):
-        # 检查坐标是否在网格范围内
-        if not (0 <= nx < grid_size and 0 <= ny < grid_size):
-            # 如果超出网格边界，标记为False（或者与注释中说的一致，返回False）
-            mask[i] = False
-            continue
+    参数:
+        env: 环境实例，包含智能体状态
+        agent_id: 当前智能体ID
         
-        # 检查该位置是否有其他智能体
-        for other_id, other_state in agent_states.items():
-            if other_id == agent_id:
-                continue  # 跳过当前智能体自身
-                
-            other_pos = other_state['position']
-            other_dir_flag = other_state['direction']  # 0: A→B, 1: B→A
-            
-            # 如果该位置有其他智能体，并且方向与当前智能体相反
-            if other_pos == (nx, ny) and other_dir_flag != current_dir_flag:
-                mask[i] = True
-                break
-    
-    # 返回8位布尔元组
-    return tuple(mask)
+    返回:
+        8位布尔元组，按照 NW, N, NE, W, E, SW, S, SE 的顺序，
+        True 表示对应格子被"反向移动方向"的其他智能体占用
+    """
+    mask = opp_dir_masks(env.pos, env.directions, env.grid_size)
+    return tuple(mask[agent_id].tolist())
 
 
 # 导出主要的函数
-__all__ = ['opp_dir_mask', 'neighbour_coords']
+__all__ = ['opp_dir_mask', 'opp_dir_masks', 'neighbour_coords', 'NEIGHBOUR_OFFSETS']
 
@@ -0,0 +1,284 @@
+"""
+向量化环境模块 - 在一个 NumPy 张量上同时运行 K 个网格世界副本
+
+此模块提供 VectorGridWorldEnv，它把 K 个 GridWorldEnv 的状态堆叠成带批次维度的
+SoA 数组，一次 step() 就完成所有环境的动力学更新，从而把 Python 开销摊薄到 K 个环境上。
+"""
+
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from . import (_ACTION_DELTAS, _MAX_GRID_SIZE, GRID_SIZE, NUM_AGENTS,
+               COLLISION_PENALTY, DELIVERY_REWARD, OBS_DIM)
+
+
+class VectorGridWorldEnv:
+    """
+    批量网格世界环境
+    
+    K 个环境的状态存储为:
+        pos:        (K, N, 2) 智能体位置
+        carrying:   (K, N)    是否携带物品
+        directions: (K, N)    方向 (0: A→B, 1: B→A)
+        location_A: (K, 2)    每个环境的 A 位置
+        location_B: (K, 2)    每个环境的 B 位置
+    
+    用法:
+        env = VectorGridWorldEnv(num_envs=128)
+        obs = env.reset()                      # (K, N, OBS_DIM)
+        obs, rewards, dones, info = env.step(actions)   # actions: (K, N)
+    """
+    
+    def __init__(self,
+                 num_envs: int,
+                 grid_size: int = GRID_SIZE,
+                 num_agents: int = NUM_AGENTS,
+                 collision_penalty: float = COLLISION_PENALTY,
+                 delivery_reward: float = DELIVERY_REWARD,
+                 seed: Optional[int] = None):
+        """
+        初始化批量网格世界环境
+        
+        参数:
+            num_envs: 并行环境数量 K
+            grid_size: 网格的大小 (默认 5x5)
+            num_agents: 每个环境的智能体数量 (默认 4)
+            collision_penalty: 碰撞惩罚值 (默认 -10.0)
+            delivery_reward: 成功运送的奖励值 (默认 1.0)
+            seed: 随机种子 (默认 None)
+        """
+        assert grid_size <= _MAX_GRID_SIZE, f"网格大小不能超过 {_MAX_GRID_SIZE} (状态以 int8 存储)"
+        
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.num_agents = num_agents
+        self.collision_penalty = collision_penalty
+        self.delivery_reward = delivery_reward
+        self.rng = np.random.default_rng(seed)
+        
+        K, N = num_envs, num_agents
+        
+        # 批量 SoA 状态
+        self.pos = np.zeros((K, N, 2), dtype=np.int8)
+        self.carrying = np.zeros((K, N), dtype=np.int8)
+        self.directions = np.zeros((K, N), dtype=np.int8)
+        self.location_A = np.zeros((K, 2), dtype=np.int8)
+        self.location_B = np.zeros((K, 2), dtype=np.int8)
+        self._A_keys = np.zeros(K, dtype=np.intp)
+        self._B_keys = np.zeros(K, dtype=np.intp)
+        
+        # A 和 B 在扁平格子表中的键 (格子键加上环境偏移)，由 reset() 写入
+        self._A_flat_keys = np.zeros(K, dtype=np.intp)
+        self._B_flat_keys = np.zeros(K, dtype=np.intp)
+        
+        # 每个环境的累计步数和统计量
+        self.steps = np.zeros(K, dtype=np.int64)
+        self.total_reward = np.zeros(K, dtype=np.float64)
+        self.total_collisions = np.zeros(K, dtype=np.int64)
+        self.total_deliveries = np.zeros(K, dtype=np.int64)
+        
+        # 每个环境在扁平格子表中的起始偏移，用于一次性对所有环境分组
+        self._cell_offsets = np.arange(K, dtype=np.intp) * (grid_size * grid_size)
+        
+        # 预分配的 float32 观察缓冲区，每一步原地刷新 (int8 状态写入时自动转换)
+        self._obs_buf = np.empty((K, N, OBS_DIM), dtype=np.float32)
+        
+        # 碰撞检测用的固定大小暂存区: 扁平格子方向位表 (保持全零)、方向位和碰撞掩码
+        self._cell_dirs_buf = np.zeros(K * grid_size * grid_size, dtype=np.uint8)
+        self._flat_keys_buf = np.empty((K, N), dtype=np.intp)
+        self._dir_bits_buf = np.empty((K, N), dtype=np.uint8)
+        self._collided_buf = np.empty((K, N), dtype=bool)
+        
+        # 每一步的动作、下一个位置、格子键和奖励缓冲区，避免单步内重复分配
+        self._actions_buf = np.empty((K, N), dtype=np.int8)
+        self._next_pos_buf = np.empty((K, N, 2), dtype=np.int8)
+        self._next_keys_buf = np.empty((K, N), dtype=np.intp)
+        self._rewards_buf = np.zeros((K, N), dtype=np.float32)
+        
+        # 环境重置
+        self.reset()
+    
+    def reset(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        重置环境到初始状态
+        
+        参数:
+            mask: 形状为 (K,) 的布尔数组，只重置为 True 的环境；默认重置全部环境
+        
+        返回:
+            观察数组，形状为 (K, N, OBS_DIM)
+        """
+        if mask is None:
+            idx = np.arange(self.num_envs)
+        else:
+            idx = np.flatnonzero(mask)
+        
+        # 一次性为所有需要重置的环境抽样互不相同的 A 和 B:
+        # B 从剩余的 G*G-1 个格子中抽取，再跳过 A 所在的格子，无需重试
+        G = self.grid_size
+        a = self.rng.integers(G * G, size=len(idx))
+        b = self.rng.integers(G * G - 1, size=len(idx))
+        b += b >= a
+        self.location_A[idx, 0], self.location_A[idx, 1] = np.divmod(a, G)
+        self.location_B[idx, 0], self.location_B[idx, 1] = np.divmod(b, G)
+        
+        # 缓存每个环境中 A 和 B 的格子键 (row * G + col)
+        self._A_keys[idx] = a
+        self._B_keys[idx] = b
+        self._A_flat_keys[idx] = a + self._cell_offsets[idx]
+        self._B_flat_keys[idx] = b + self._cell_offsets[idx]
+        
+        # 智能体都从 A 出发，未携带物品，方向为 A→B
+        self.pos[idx] = self.location_A[idx, None, :]
+        self.carrying[idx] = 0
+        self.directions[idx] = 0
+        
+        self.steps[idx] = 0
+        self.total_reward[idx] = 0
+        self.total_collisions[idx] = 0
+        self.total_deliveries[idx] = 0
+        
+        # A和B的位置整局内不变，只在重置时写入观察缓冲区
+        self._obs_buf[idx, :, 2:4] = self.location_A[idx, None, :]
+        self._obs_buf[idx, :, 4:6] = self.location_B[idx, None, :]
+        
+        return self._get_observations()
+    
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        在所有环境中同时执行一步
+        
+        参数:
+            actions: 形状为 (K, N) 的动作数组
+        
+        返回:
+            (observations, rewards, dones, info)
+            observations 和 rewards 指向预分配的缓冲区，下一步会被覆盖，
+            需要跨步保留时请 copy()
+        """
+        assert np.shape(actions) == (self.num_envs, self.num_agents), \
+            "动作数组形状必须为 (num_envs, num_agents)"
+        
+        actions_arr = self._actions_buf
+        actions_arr[...] = actions
+        # 与 GridWorldEnv.step 相同，写入 int8 缓冲区后统一校验动作
+        assert ((actions_arr >= 0) & (actions_arr < len(_ACTION_DELTAS))
+                & (actions_arr == actions)).all(), "动作必须是 0 到 3 之间的整数"
+        
+        G = self.grid_size
+        
+        # 增加步数计数
+        self.steps += 1
+        
+        # 一次性计算所有环境中所有智能体的下一个位置
+        next_positions = self._next_pos_buf
+        np.take(_ACTION_DELTAS, actions_arr, axis=0, out=next_positions)
+        next_positions += self.pos
+        np.clip(next_positions, 0, G - 1, out=next_positions)
+        
+        # 将位置编码为格子键 row * G + col，碰撞检测和到达A/B的判断共用
+        next_keys = self._next_keys_buf
+        np.multiply(next_positions[..., 0], G, out=next_keys, dtype=np.intp)
+        next_keys += next_positions[..., 1]
+        
+        # 检测碰撞
+        collided = self._detect_collisions(next_keys)
+        moved = ~collided
+        
+        # 发生碰撞的智能体不更新位置，给予惩罚；其余智能体更新位置
+        rewards = self._rewards_buf
+        rewards.fill(0)
+        np.copyto(rewards, self.collision_penalty, where=collided)
+        np.copyto(self.pos, next_positions, where=moved[..., None])
+        
+        # 从 B 到 A，到达 A 后获取新物品，现在方向是 A→B
+        pick_up = moved & (next_keys == self._A_keys[:, None]) & (self.directions == 1)
+        self.carrying[pick_up] = 1
+        self.directions[pick_up] = 0
+        
+        # 从 A 到 B，携带物品到达 B 后递送，现在方向是 B→A
+        deliver = (moved & (next_keys == self._B_keys[:, None]) & (self.directions == 0)
+                   & (self.carrying == 1))
+        self.carrying[deliver] = 0
+        self.directions[deliver] = 1
+        rewards[deliver] += self.delivery_reward
+        
+        # 更新统计量，总奖励直接由计数得出，无需再遍历奖励数组
+        n_coll = np.count_nonzero(collided, axis=1)
+        n_deliv = np.count_nonzero(deliver, axis=1)
+        self.total_collisions += n_coll
+        self.total_deliveries += n_deliv
+        self.total_reward += (n_coll * self.collision_penalty
+                              + n_deliv * self.delivery_reward)
+        
+        # 获取新的观察
+        observations = self._get_observations()
+        
+        # 这个任务是无限的，所以环境不会结束
+        dones = np.zeros(self.num_envs, dtype=bool)
+        
+        # 额外信息，每项都是形状为 (K,) 的数组
+        info = {
+            'steps': self.steps.copy(),
+            'total_reward': self.total_reward.copy(),
+            'total_collisions': self.total_collisions.copy(),
+            'total_deliveries': self.total_deliveries.copy()
+        }
+        
+        return observations, rewards, dones, info
+    
+    def _detect_collisions(self, next_keys: np.ndarray) -> np.ndarray:
+        """
+        检测所有环境中发生碰撞的智能体
+        
+        规则与 GridWorldEnv._detect_collisions 相同:
+        同一格子中同时出现 A→B 和 B→A 的智能体则发生碰撞，A和B位置除外。
+        
+        参数:
+            next_keys: 形状为 (K, N) 的下一个位置格子键 row * G + col
+        
+        返回:
+            形状为 (K, N) 的布尔掩码，指向预分配的缓冲区，下一步会被覆盖
+        """
+        # 格子键加上环境偏移后，所有环境共享一张扁平格子表
+        keys = self._flat_keys_buf
+        np.add(next_keys, self._cell_offsets[:, None], out=keys)
+        
+        cell_dirs = self._cell_dirs_buf
+        dir_bits = self._dir_bits_buf
+        
+        # 方向位 bit0: A→B, bit1: B→A，即 1 << direction，对 0/1 取值等于 direction + 1
+        np.add(self.directions, 1, out=dir_bits, casting='unsafe')
+        
+        # 按格子对方向位做按位或，A和B位置不检测碰撞
+        np.bitwise_or.at(cell_dirs, keys, dir_bits)
+        cell_dirs[self._A_flat_keys] = 0
+        cell_dirs[self._B_flat_keys] = 0
+        
+        # 方向位已经写入格子表，dir_bits 复用为每个智能体所在格子的方向位
+        np.take(cell_dirs, keys, out=dir_bits)
+        np.equal(dir_bits, 3, out=self._collided_buf)
+        
+        # 只清零本步写过的格子，保持格子表全零以供下一步复用
+        cell_dirs[keys] = 0
+        
+        return self._collided_buf
+    
+    def _get_observations(self) -> np.ndarray:
+        """
+        获取所有环境中所有智能体的观察
+        
+        列布局与 GridWorldEnv 相同:
+        [row, col, A_row, A_col, B_row, B_col, carrying, direction]。
+        A和B的列由 reset() 写入，这里只刷新每步变化的列。
+        返回的是缓冲区本身，下一次 step()/reset() 会覆盖它，需要跨步保留时请 copy()。
+        """
+        buf = self._obs_buf
+        buf[..., 0:2] = self.pos
+        buf[..., 6] = self.carrying
+        buf[..., 7] = self.directions
+        return buf
+
+
+# 导出主要的类
+__all__ = ['VectorGridWorldEnv']
@@ -0,0 +1,79 @@
+"""
+测试共用的夹具 - 按名称构造各个后端，并把指定状态写入环境
+"""
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+from gridworld import GridWorldEnv
+
+
+# 单环境后端: 默认配置的特化类、通用 NumPy 路径和 numba 内核
+BACKENDS = ['GridWorld5x4Env', 'numpy', 'numba']
+
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+
+class NumpyGridWorldEnv(GridWorldEnv):
+    """GridWorldEnv 的空子类，绕过 __new__ 的分派，用于在 5x4 配置下测试 NumPy 路径"""
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """依次取每个单环境后端的名称"""
+    return request.param
+
+
+@pytest.fixture
+def make_env():
+    """返回按后端名称构造单环境的工厂函数，未安装 numba 时跳过 numba 后端"""
+    def make(backend, **kwargs):
+        if backend == 'numba':
+            if not HAS_NUMBA:
+                pytest.skip("未安装 numba")
+            return GridWorldEnv(use_numba=True, **kwargs)
+        if backend == 'numpy':
+            return NumpyGridWorldEnv(**kwargs)
+        return GridWorldEnv(**kwargs)
+    return make
+
+
+@pytest.fixture
+def set_state():
+    """
+    返回把状态写入环境的函数，同步缓存的 A/B 格子键和观察缓冲区中的 A/B 列
+    
+    单环境直接写入；VectorGridWorldEnv 需要通过 k 指定写入第几个环境。
+    """
+    def set_state(env, location_A, location_B, pos, directions, carrying=None, k=None):
+        G = env.grid_size
+        key_A = location_A[0] * G + location_A[1]
+        key_B = location_B[0] * G + location_B[1]
+        if carrying is None:
+            carrying = [0] * env.num_agents
+        
+        if k is None:
+            env.location_A = np.array(location_A, dtype=np.int8)
+            env.location_B = np.array(location_B, dtype=np.int8)
+            env._A_key = key_A
+            env._B_key = key_B
+            env.pos[:] = pos
+            env.directions[:] = directions
+            env.carrying[:] = carrying
+            env._obs_buf[:, 2:4] = env.location_A
+            env._obs_buf[:, 4:6] = env.location_B
+        else:
+            env.location_A[k] = location_A
+            env.location_B[k] = location_B
+            env._A_keys[k] = key_A
+            env._B_keys[k] = key_B
+            env._A_flat_keys[k] = key_A + env._cell_offsets[k]
+            env._B_flat_keys[k] = key_B + env._cell_offsets[k]
+            env.pos[k] = pos
+            env.directions[k] = directions
+            env.carrying[k] = carrying
+            env._obs_buf[k, :, 2:4] = location_A
+            env._obs_buf[k, :, 4:6] = location_B
+    return set_state
@@ -0,0 +1,84 @@
+"""
+异步环境测试 - 子进程中的环境与同进程的 GridWorldEnv 行为一致，出错后仍可使用和关闭
+"""
+
+import numpy as np
+import pytest
+
+from gridworld import GridWorldEnv
+from gridworld.async_env import AsyncGridWorldEnv
+
+
+@pytest.fixture
+def env():
+    env = AsyncGridWorldEnv(num_envs=2, seed=0)
+    yield env
+    env.close()
+
+
+def test_step_async_wait_round_trip(env):
+    local = [GridWorldEnv(seed=k) for k in range(2)]
+    obs = env.reset()
+    np.testing.assert_array_equal(obs, np.stack([e.reset() for e in local]))
+    
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        actions = rng.integers(4, size=(2, 4))
+        env.step_async(actions)
+        obs, rewards, dones, infos = env.step_wait()
+        
+        expected = [e.step(a.tolist()) for e, a in zip(local, actions)]
+        np.testing.assert_array_equal(obs, np.stack([o for o, _, _, _ in expected]))
+        np.testing.assert_array_equal(rewards, np.stack([r for _, r, _, _ in expected]))
+        assert not dones.any()
+        assert infos == [info for _, _, _, info in expected]
+
+
+def test_seeded_reset_is_reproducible(env):
+    other = AsyncGridWorldEnv(num_envs=2, seed=0)
+    try:
+        np.testing.assert_array_equal(env.reset(), other.reset())
+    finally:
+        other.close()
+
+
+def test_worker_error_raises_runtime_error(env):
+    env.reset()
+    with pytest.raises(RuntimeError, match="AssertionError"):
+        env.step(np.full((2, 4), 4))
+    
+    # 子进程在报告错误后仍然可用
+    obs, _, _, _ = env.step(np.zeros((2, 4), dtype=int))
+    assert obs.shape == (2, 4, 8)
+
+
+def test_close_after_error(env):
+    env.reset()
+    with pytest.raises(RuntimeError):
+        env.step(np.zeros((2, 5), dtype=int))
+    
+    env.close()
+    assert env.closed
+    assert not any(p.is_alive() for p in env.processes)
+
+
+def test_reset_while_step_pending(env):
+    env.reset()
+    env.step_async(np.zeros((2, 4), dtype=int))
+    with pytest.raises(AssertionError):
+        env.reset()
+    
+    # 取回挂起的一步后，管道中的回复与命令仍然一一对应
+    obs, rewards, _, _ = env.step_wait()
+    assert rewards.shape == (2, 4)
+    assert env.reset().shape == obs.shape
+
+
+def test_env_construction_error_is_reported():
+    env = AsyncGridWorldEnv(num_envs=2, grid_size=200)
+    try:
+        for _ in range(2):
+            with pytest.raises(RuntimeError, match="网格大小不能超过"):
+                env.reset()
+    finally:
+        env.close()
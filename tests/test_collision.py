@@ -0,0 +1,76 @@
+"""
+碰撞规则测试 - 对向进入同一格子才算碰撞，A和B位置不检测碰撞
+"""
+
+import numpy as np
+import pytest
+
+from gridworld import Action
+from gridworld.vector_env import VectorGridWorldEnv
+
+
+# 智能体 0 和 1 分别从 (2,1) 向东、从 (2,3) 向西进入 (2,2)，
+# 智能体 2 和 3 停在角落里向墙移动，原地不动
+_POS = [[2, 1], [2, 3], [0, 0], [4, 4]]
+_ACTIONS = [Action.EAST, Action.WEST, Action.NORTH, Action.SOUTH]
+
+
+def test_opposite_directions_collide(backend, make_env, set_state):
+    env = make_env(backend)
+    set_state(env, location_A=[0, 4], location_B=[4, 0], pos=_POS, directions=[0, 1, 0, 0])
+    
+    _, rewards, _, info = env.step(_ACTIONS)
+    
+    assert env.pos.tolist() == _POS
+    np.testing.assert_array_equal(rewards, [env.collision_penalty] * 2 + [0, 0])
+    assert info['total_collisions'] == 2
+
+
+def test_same_direction_does_not_collide(backend, make_env, set_state):
+    env = make_env(backend)
+    set_state(env, location_A=[0, 4], location_B=[4, 0], pos=_POS, directions=[1, 1, 0, 0])
+    
+    _, rewards, _, info = env.step(_ACTIONS)
+    
+    assert env.pos[:2].tolist() == [[2, 2], [2, 2]]
+    np.testing.assert_array_equal(rewards, 0)
+    assert info['total_collisions'] == 0
+
+
+@pytest.mark.parametrize('target', ['A', 'B'])
+def test_no_collision_at_A_or_B(backend, target, make_env, set_state):
+    env = make_env(backend)
+    if target == 'A':
+        set_state(env, location_A=[2, 2], location_B=[4, 0], pos=_POS, directions=[0, 1, 0, 0])
+    else:
+        set_state(env, location_A=[0, 4], location_B=[2, 2], pos=_POS, directions=[0, 1, 0, 0],
+                  carrying=[1, 0, 0, 0])
+    
+    _, rewards, _, info = env.step(_ACTIONS)
+    
+    assert env.pos[:2].tolist() == [[2, 2], [2, 2]]
+    assert info['total_collisions'] == 0
+    if target == 'A':
+        # B→A 的智能体 1 在 A 取到新物品
+        assert env.carrying.tolist()[:2] == [0, 1]
+        assert env.directions.tolist()[:2] == [0, 0]
+        np.testing.assert_array_equal(rewards, 0)
+    else:
+        # 携带物品的智能体 0 在 B 完成递送
+        assert env.carrying.tolist()[:2] == [0, 0]
+        assert env.directions.tolist()[:2] == [1, 1]
+        np.testing.assert_array_equal(rewards, [env.delivery_reward, 0, 0, 0])
+
+
+def test_vector_env_collides_per_env(set_state):
+    env = VectorGridWorldEnv(num_envs=2)
+    set_state(env, location_A=[0, 4], location_B=[4, 0], pos=_POS, directions=[0, 1, 0, 0], k=0)
+    set_state(env, location_A=[2, 2], location_B=[4, 0], pos=_POS, directions=[0, 1, 0, 0], k=1)
+    
+    _, rewards, _, info = env.step(np.array([_ACTIONS, _ACTIONS]))
+    
+    # 环境 0 中 (2,2) 是普通格子，发生碰撞；环境 1 中 (2,2) 是 A，不检测碰撞
+    np.testing.assert_array_equal(info['total_collisions'], [2, 0])
+    assert env.pos[0].tolist() == _POS
+    assert env.pos[1, :2].tolist() == [[2, 2], [2, 2]]
+    np.testing.assert_array_equal(rewards[0], [env.collision_penalty] * 2 + [0, 0])
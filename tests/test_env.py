@@ -0,0 +1,200 @@
+"""
+环境等价性测试 - 所有后端在相同的随机轨迹上必须与原始的逐智能体实现一致
+
+参考实现 _reference_step 按最初的纯 Python 语义逐个智能体地执行一步，
+各后端从相同的随机状态出发、执行相同的随机动作，逐步比较状态、奖励和统计量。
+"""
+
+import numpy as np
+import pytest
+
+from gridworld import GridWorldEnv, GridWorld5x4Env
+from gridworld.vector_env import VectorGridWorldEnv
+
+
+def _random_state(rng, grid_size, num_agents):
+    """随机生成一个合法的环境状态 (A 和 B 不同，智能体位置、携带状态和方向任意)"""
+    a, b = rng.choice(grid_size * grid_size, size=2, replace=False)
+    return {
+        'location_A': [int(a) // grid_size, int(a) % grid_size],
+        'location_B': [int(b) // grid_size, int(b) % grid_size],
+        'pos': rng.integers(grid_size, size=(num_agents, 2)).tolist(),
+        'carrying': rng.integers(2, size=num_agents).tolist(),
+        'directions': rng.integers(2, size=num_agents).tolist(),
+    }
+
+
+def _reference_step(state, actions, grid_size, collision_penalty, delivery_reward):
+    """按原始实现的语义原地执行一步，返回 (rewards, 碰撞数, 运送数)"""
+    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    next_positions = []
+    for (r, c), a in zip(state['pos'], actions):
+        dr, dc = moves[a]
+        next_positions.append([min(max(r + dr, 0), grid_size - 1),
+                               min(max(c + dc, 0), grid_size - 1)])
+    
+    # 同一格子中同时出现两种方向的智能体则全部碰撞，A和B位置除外
+    cells = {}
+    for i, p in enumerate(next_positions):
+        cells.setdefault(tuple(p), []).append(i)
+    collided = set()
+    for cell, agents in cells.items():
+        if list(cell) in (state['location_A'], state['location_B']):
+            continue
+        if len({state['directions'][i] for i in agents}) == 2:
+            collided.update(agents)
+    
+    rewards = [0.0] * len(actions)
+    n_coll = n_deliv = 0
+    for i, p in enumerate(next_positions):
+        if i in collided:
+            rewards[i] += collision_penalty
+            n_coll += 1
+            continue
+        state['pos'][i] = p
+        if p == state['location_A'] and state['directions'][i] == 1:
+            state['carrying'][i] = 1
+            state['directions'][i] = 0
+        elif (p == state['location_B'] and state['directions'][i] == 0
+              and state['carrying'][i] == 1):
+            state['carrying'][i] = 0
+            state['directions'][i] = 1
+            rewards[i] += delivery_reward
+            n_deliv += 1
+    return rewards, n_coll, n_deliv
+
+
+def test_default_config_dispatches_to_specialized_env(make_env):
+    assert type(GridWorldEnv()) is GridWorld5x4Env
+    assert type(GridWorldEnv(grid_size=6)) is GridWorldEnv
+    assert not isinstance(make_env('numpy'), GridWorld5x4Env)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_backend_matches_reference(backend, seed, make_env, set_state):
+    env = make_env(backend)
+    
+    rng = np.random.default_rng(seed)
+    for _ in range(5):
+        state = _random_state(rng, env.grid_size, env.num_agents)
+        set_state(env, **state)
+        env.steps = env.total_collisions = env.total_deliveries = 0
+        env.total_reward = 0
+        total_coll = total_deliv = 0
+        
+        for _ in range(100):
+            actions = rng.integers(4, size=env.num_agents).tolist()
+            expected, n_coll, n_deliv = _reference_step(
+                state, actions, env.grid_size, env.collision_penalty, env.delivery_reward)
+            total_coll += n_coll
+            total_deliv += n_deliv
+            
+            obs, rewards, done, info = env.step(actions)
+            
+            assert env.pos.tolist() == state['pos']
+            assert env.carrying.tolist() == state['carrying']
+            assert env.directions.tolist() == state['directions']
+            np.testing.assert_array_equal(rewards, expected)
+            np.testing.assert_array_equal(obs[:, 0:2], state['pos'])
+            assert info['total_collisions'] == total_coll
+            assert info['total_deliveries'] == total_deliv
+            assert info['total_reward'] == pytest.approx(
+                total_coll * env.collision_penalty + total_deliv * env.delivery_reward)
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_vector_env_matches_reference(seed, set_state):
+    K = 3
+    env = VectorGridWorldEnv(num_envs=K)
+    G, N = env.grid_size, env.num_agents
+    
+    rng = np.random.default_rng(seed)
+    states = [_random_state(rng, G, N) for _ in range(K)]
+    for k, state in enumerate(states):
+        set_state(env, **state, k=k)
+    env.total_collisions[:] = env.total_deliveries[:] = 0
+    env.total_reward[:] = 0
+    totals = np.zeros((K, 2), dtype=np.int64)
+    
+    for _ in range(200):
+        actions = rng.integers(4, size=(K, N))
+        obs, rewards, dones, info = env.step(actions)
+        
+        for k, state in enumerate(states):
+            expected, n_coll, n_deliv = _reference_step(
+                state, actions[k].tolist(), G, env.collision_penalty, env.delivery_reward)
+            totals[k] += (n_coll, n_deliv)
+            
+            assert env.pos[k].tolist() == state['pos']
+            assert env.carrying[k].tolist() == state['carrying']
+            assert env.directions[k].tolist() == state['directions']
+            np.testing.assert_array_equal(rewards[k], expected)
+        
+        np.testing.assert_array_equal(info['total_collisions'], totals[:, 0])
+        np.testing.assert_array_equal(info['total_deliveries'], totals[:, 1])
+
+
+@pytest.mark.parametrize('actions', [[0, 0, 0, 4], [0, -1, 0, 0], np.array([0, 256, 0, 0])])
+def test_invalid_actions_rejected(backend, actions, make_env):
+    env = make_env(backend)
+    with pytest.raises(AssertionError):
+        env.step(actions)
+    assert env.steps == 0
+
+
+def test_as_dict_uses_plain_python_types():
+    env = GridWorldEnv(seed=0)
+    env.step([1, 1, 3, 3])
+    obs = env.as_dict()
+    
+    assert sorted(obs) == list(range(env.num_agents))
+    for i, agent_obs in obs.items():
+        assert agent_obs['position'] == env.pos[i].tolist()
+        assert agent_obs['location_A'] == env.location_A.tolist()
+        assert agent_obs['location_B'] == env.location_B.tolist()
+        assert type(agent_obs['carrying']) is int
+        assert type(agent_obs['direction']) is int
+
+
+@pytest.mark.parametrize('actions', [[1.0, 1, 3, 3], np.array([1, 1, 3, 3]), [True, 1, 3, 3],
+                                     [np.float64(2.0), 1, 3, 3], [1.5, 1, 3, 3]])
+def test_specialized_env_accepts_same_actions_as_generic(actions, make_env):
+    results = []
+    for env in (make_env('GridWorld5x4Env', seed=0), make_env('numpy', seed=0)):
+        try:
+            _, rewards, _, _ = env.step(actions)
+            results.append((env.pos.tolist(), rewards.tolist()))
+        except AssertionError:
+            results.append('rejected')
+    assert results[0] == results[1]
+
+
+def test_seeded_reset_is_reproducible():
+    a, b = GridWorldEnv(seed=3), GridWorldEnv(seed=3)
+    for _ in range(10):
+        np.testing.assert_array_equal(a.reset(), b.reset())
+        assert a._A_key == b._A_key and a._B_key == b._B_key
+    
+    # 不同的种子给出不同的 A/B 布局
+    envs = [GridWorldEnv(seed=seed) for seed in range(10)]
+    layouts = {(env._A_key, env._B_key) for env in envs}
+    assert len(layouts) > 1
+
+
+@pytest.mark.parametrize('grid_size', [2, 5, 9])
+def test_reset_samples_distinct_A_and_B(grid_size):
+    env = GridWorldEnv(grid_size=grid_size, seed=0)
+    G = grid_size
+    cells = set()
+    for _ in range(1000):
+        obs = env.reset()
+        assert env.location_A.tolist() != env.location_B.tolist()
+        assert env._A_key == env.location_A[0] * G + env.location_A[1]
+        assert env._B_key == env.location_B[0] * G + env.location_B[1]
+        assert (env.pos == env.location_A).all()
+        assert not env.carrying.any() and not env.directions.any()
+        np.testing.assert_array_equal(obs[:, 2:4], np.broadcast_to(env.location_A, (env.num_agents, 2)))
+        cells.add(env._A_key)
+    
+    # A 的抽样能取到网格中的每一个格子
+    assert len(cells) == G * G
@@ -0,0 +1,57 @@
+"""
+渲染测试 - 输出与原始的逐行打印实现一致，render_every 控制实际打印的频率
+"""
+
+import numpy as np
+import pytest
+
+from gridworld import GridWorldEnv
+
+
+def _reference_render(env):
+    """按原始实现逐行拼出期望的输出"""
+    G = env.grid_size
+    grid = [[' ' for _ in range(G)] for _ in range(G)]
+    a_row, a_col = env.location_A.tolist()
+    b_row, b_col = env.location_B.tolist()
+    grid[a_row][a_col] = 'A'
+    grid[b_row][b_col] = 'B'
+    for i, (row, col) in enumerate(env.pos.tolist()):
+        if grid[row][col] in ['A', 'B']:
+            grid[row][col] += str(i)
+        else:
+            marker = str(i)
+            if env.carrying[i]:
+                marker += '+'
+            marker += '→' if env.directions[i] == 0 else '←'
+            grid[row][col] = marker
+    
+    lines = [f"Step: {env.steps}, Deliveries: {env.total_deliveries}, "
+             f"Collisions: {env.total_collisions}", "-" * (G * 4 + 1)]
+    for row in grid:
+        lines.append("| " + " | ".join(f"{cell:<3}" for cell in row) + " |")
+        lines.append("-" * (G * 4 + 1))
+    return "\n".join(lines) + "\n"
+
+
+@pytest.mark.parametrize('grid_size', [5, 7])
+def test_render_matches_reference(grid_size, capsys):
+    env = GridWorldEnv(grid_size=grid_size, seed=0)
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        env.step(rng.integers(4, size=env.num_agents).tolist())
+        env.carrying[:] = rng.integers(2, size=env.num_agents)
+        env.render()
+        assert capsys.readouterr().out == _reference_render(env)
+
+
+def test_render_every(capsys):
+    env = GridWorldEnv(seed=0, render_every=3)
+    printed = []
+    for _ in range(7):
+        env.step([0, 1, 2, 3])
+        env.render()
+        printed.append(capsys.readouterr().out != "")
+    
+    # 只在 steps 为 3 的整数倍时打印
+    assert printed == [False, False, True, False, False, True, False]
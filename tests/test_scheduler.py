@@ -0,0 +1,17 @@
+"""
+调度器测试 - CentralClock 按固定顺序轮询，shuffle 后从新顺序的开头重新开始
+"""
+
+from itertools import islice
+
+from gridworld.scheduler import CentralClock
+
+
+def test_central_clock_round_robin_and_shuffle():
+    clock = CentralClock(agent_ids=[0, 1, 2, 3])
+    assert list(islice(clock, 5)) == [0, 1, 2, 3, 0]
+    
+    clock.shuffle([3, 2, 1, 0])
+    assert list(islice(clock, 5)) == [3, 2, 1, 0, 3]
+    
+    assert list(CentralClock(agent_ids=[])) == []
@@ -0,0 +1,43 @@
+"""
+传感器测试 - 向量化的反向占用掩码与逐个邻居检查的结果一致
+"""
+
+import numpy as np
+import pytest
+
+from gridworld import GridWorldEnv
+from gridworld.sensors import neighbour_coords, opp_dir_mask, opp_dir_masks
+
+
+def _reference_mask(pos, dirs, grid_size, agent_id):
+    """逐个检查8个相邻格子中是否有方向相反的其他智能体"""
+    mask = []
+    for nx, ny in neighbour_coords(tuple(pos[agent_id])):
+        mask.append(0 <= nx < grid_size and 0 <= ny < grid_size and any(
+            other != agent_id and tuple(pos[other]) == (nx, ny) and dirs[other] != dirs[agent_id]
+            for other in range(len(pos))))
+    return mask
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_opp_dir_masks_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    G, N = 5, 12
+    pos = rng.integers(G, size=(N, 2)).tolist()
+    dirs = rng.integers(2, size=N).tolist()
+    
+    masks = opp_dir_masks(np.array(pos), np.array(dirs), G)
+    
+    assert masks.shape == (N, 8)
+    for i in range(N):
+        assert masks[i].tolist() == _reference_mask(pos, dirs, G, i)
+
+
+def test_opp_dir_mask_on_env():
+    env = GridWorldEnv()
+    env.pos[:] = [[2, 2], [1, 1], [3, 2], [0, 4]]
+    env.directions[:] = [0, 1, 1, 0]
+    
+    # 智能体 0 的西北 (1,1) 和南 (3,2) 有 B→A 的智能体；角落里的智能体 3 周围没有其他智能体
+    assert opp_dir_mask(env, 0) == (True, False, False, False, False, False, True, False)
+    assert opp_dir_mask(env, 3) == (False,) * 8
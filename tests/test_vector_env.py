@@ -0,0 +1,61 @@
+"""
+批量环境测试 - reset(mask) 只重置选中的环境，其余环境的状态保持不变
+"""
+
+import numpy as np
+
+from gridworld import OBS_DIM
+from gridworld.vector_env import VectorGridWorldEnv
+
+
+def test_reset_all():
+    env = VectorGridWorldEnv(num_envs=8, seed=0)
+    obs = env.reset()
+    
+    assert obs.shape == (8, env.num_agents, OBS_DIM)
+    assert (env.location_A != env.location_B).any(axis=1).all()
+    np.testing.assert_array_equal(env.pos, np.broadcast_to(env.location_A[:, None], env.pos.shape))
+    np.testing.assert_array_equal(obs[..., 2:4], np.broadcast_to(env.location_A[:, None], (8, 4, 2)))
+    np.testing.assert_array_equal(obs[..., 4:6], np.broadcast_to(env.location_B[:, None], (8, 4, 2)))
+    np.testing.assert_array_equal(env._A_keys, env.location_A[:, 0] * env.grid_size + env.location_A[:, 1])
+
+
+def test_reset_mask_only_resets_selected_envs():
+    env = VectorGridWorldEnv(num_envs=4, seed=0)
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        env.step(rng.integers(4, size=(4, env.num_agents)))
+    
+    mask = np.array([True, False, True, False])
+    before = {name: getattr(env, name).copy()
+              for name in ('pos', 'carrying', 'directions', 'location_A', 'location_B',
+                           'steps', 'total_collisions', 'total_reward')}
+    obs = env.reset(mask).copy()
+    
+    # 未选中的环境状态和观察都不变
+    for name, value in before.items():
+        np.testing.assert_array_equal(getattr(env, name)[~mask], value[~mask])
+    
+    # 选中的环境回到初始状态: 智能体都在 A，未携带物品，方向为 A→B，统计量清零
+    np.testing.assert_array_equal(env.pos[mask],
+                                  np.broadcast_to(env.location_A[mask][:, None], (2, 4, 2)))
+    assert not env.carrying[mask].any() and not env.directions[mask].any()
+    assert not env.steps[mask].any() and not env.total_collisions[mask].any()
+    np.testing.assert_array_equal(obs[mask][..., 2:4],
+                                  np.broadcast_to(env.location_A[mask][:, None], (2, 4, 2)))
+    np.testing.assert_array_equal(env._A_flat_keys, env._A_keys + env._cell_offsets)
+    np.testing.assert_array_equal(env._B_flat_keys, env._B_keys + env._cell_offsets)
+    
+    # 重置后的环境可以继续和其余环境一起正常运行
+    _, _, _, info = env.step(np.zeros((4, env.num_agents), dtype=int))
+    np.testing.assert_array_equal(info['steps'], np.where(mask, 1, before['steps'] + 1))
+
+
+def test_seeded_envs_are_reproducible():
+    a = VectorGridWorldEnv(num_envs=4, seed=1)
+    b = VectorGridWorldEnv(num_envs=4, seed=1)
+    np.testing.assert_array_equal(a.location_A, b.location_A)
+    np.testing.assert_array_equal(a.location_B, b.location_B)
+    
+    mask = np.array([False, True, True, False])
+    np.testing.assert_array_equal(a.reset(mask), b.reset(mask))